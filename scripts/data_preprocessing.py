@@ -1,8 +1,26 @@
+import hashlib
 import logging
 import os
+import numpy as np
 import pandas as pd
 from IPython.display import display, Markdown  
 
+try:
+    import duckdb
+except ImportError:  # DuckDB is optional; inspect falls back to pandas
+    duckdb = None
+
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; inspect falls back to pandas
+    pl = None
+
+# Backends accepted by DataPreprocessor.inspect for the summary tables
+SUMMARY_BACKENDS = ("auto", "duckdb", "polars", "pandas")
+
+# Row labels of df.describe() for numeric columns
+_SUMMARY_STATISTICS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
 
 class DataPreprocessor:
     def __init__(
@@ -19,13 +37,17 @@ class DataPreprocessor:
         Parameters:
         file_path (str): The local file path to the data file.
         output_dir (str): The directory where the data file will be saved.
-        output_file (str): The local file name to save the downloaded data.
+        output_file (str): The local file name to save the downloaded data. A Parquet
+            cache of the parsed data is kept next to it, named after the source file path.
         log_file (str): The file where logs will be saved.
         log_level (logging level): The level of logging (default is logging.INFO).
         """
         self.file_path = file_path
         self.output_dir = output_dir
         self.output_file = os.path.join(self.output_dir, output_file)
+        # Key the cache on the source path so different source files never share one
+        source_key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:12]
+        self.cache_file = f"{os.path.splitext(self.output_file)[0]}.{source_key}.parquet"
         self.data: pd.DataFrame = None
         self.logger = self.setup_logging(log_file, log_level)
 
@@ -45,21 +67,30 @@ class DataPreprocessor:
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-        logger = logging.getLogger(__name__)
+        # One logger per log file, so instances with different log files stay separate;
+        # keyed on a short hash of the path, as the path's dots would nest logger names
+        log_key = hashlib.sha1(os.path.abspath(log_file).encode("utf-8")).hexdigest()[:12]
+        logger = logging.getLogger(__name__).getChild(log_key)
         logger.setLevel(log_level)
 
-        # Create a file handler for logging
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
+        # Only add the file handler once, however many instances share this log file
+        if not logger.handlers:
+            # Create a file handler for logging
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setLevel(log_level)
 
-        # Define the logging format
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        file_handler.setFormatter(formatter)
+            # Define the logging format
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+            file_handler.setFormatter(formatter)
 
-        # Add the handler to the logger
-        logger.addHandler(file_handler)
+            # Add the handler to the logger
+            logger.addHandler(file_handler)
+
+        # A later call may ask for a different level than the existing handler has
+        for handler in logger.handlers:
+            handler.setLevel(log_level)
 
         return logger
 
@@ -67,6 +98,9 @@ class DataPreprocessor:
         """
         Load the dataset from the local file path and save it in the specified directory.
 
+        The parsed data is cached as Parquet in the output directory; later calls read
+        the cache instead of re-parsing the CSV unless the source file has changed.
+
         Returns:
         pd.DataFrame: The loaded dataset.
         """
@@ -74,15 +108,38 @@ class DataPreprocessor:
             os.makedirs(self.output_dir, exist_ok=True)
             self.logger.info(f"Directory checked/created: {self.output_dir}")
 
+            if self._is_cache_fresh():
+                self.logger.info(f"Loading data from Parquet cache: {self.cache_file}")
+                self.data = pd.read_parquet(self.cache_file, engine="pyarrow")
+                self.logger.info("Data loaded into DataFrame successfully.")
+                return self.data
+
             self.logger.info("Loading data from the local file path.")
 
-            self.data = pd.read_csv(self.file_path)
+            # Parse with the multithreaded pyarrow engine, keeping Date as text so
+            # that mixed date formats are still handled by pd.to_datetime below
+            try:
+                self.data = pd.read_csv(
+                    self.file_path, engine="pyarrow", dtype={"Date": "string"}
+                )
+            except pd.errors.ParserError as e:
+                # pyarrow rejects some files the C engine tolerates (e.g. a trailing
+                # whitespace-only line)
+                self.logger.warning(f"pyarrow CSV parsing failed ({e}); retrying with the C engine.")
+                self.data = pd.read_csv(self.file_path, dtype={"Date": "string"})
 
             # Convert Date to Datetime format
             self.data["Date"] = pd.to_datetime(
                 self.data["Date"].str.strip(), errors="coerce"
             )
 
+            # The cache is only an optimization, so failing to write it is not fatal
+            try:
+                self.data.to_parquet(self.cache_file, engine="pyarrow", compression="zstd")
+                self.logger.info(f"Parquet cache written: {self.cache_file}")
+            except Exception as e:
+                self.logger.warning(f"Could not write Parquet cache {self.cache_file}: {e}")
+
             self.logger.info("Data loaded into DataFrame successfully.")
             return self.data
 
@@ -90,22 +147,48 @@ class DataPreprocessor:
             self.logger.error(f"Error loading data: {e}")
             raise
 
+    def _is_cache_fresh(self) -> bool:
+        """
+        Check whether the Parquet cache exists and is not older than the source file.
+        A missing source file is a cache miss, so reading it raises as usual.
 
-    def inspect(self, df: pd.DataFrame) -> pd.DataFrame:
+        Returns:
+        bool: True if the cache can be used in place of the source file.
+        """
+        if not os.path.exists(self.cache_file) or not os.path.exists(self.file_path):
+            return False
+        return os.path.getmtime(self.cache_file) >= os.path.getmtime(self.file_path)
+
+
+    def inspect(self, df: pd.DataFrame, backend: str = "auto") -> pd.DataFrame:
         """
         Inspect the given DataFrame for structure, completeness, summary statistics,
         correlation, and outlier detection.
 
         Parameters:
         - df (pd.DataFrame): The DataFrame to inspect.
+        - backend (str): Engine for the missing/unique/summary tables: "duckdb", "polars",
+          "pandas", or "auto" (default) for DuckDB, then Polars, then pandas, whichever
+          is installed first.
 
         Returns:
         - pd.DataFrame: Summary statistics for numeric columns.
         """
         if df.empty:
             raise ValueError("The DataFrame is empty.")
+        if backend not in SUMMARY_BACKENDS:
+            raise ValueError(f"Unknown summary backend {backend!r}; expected one of {SUMMARY_BACKENDS}.")
+        if backend == "duckdb" and duckdb is None:
+            raise ImportError("The 'duckdb' summary backend requires DuckDB to be installed.")
+        if backend == "polars" and pl is None:
+            raise ImportError("The 'polars' summary backend requires Polars to be installed.")
 
         try:
+            numeric_df = df.select_dtypes(include='number')
+            missing_values, unique_values, summary_statistics = self._summarize(
+                df, numeric_df.columns, backend
+            )
+
             # Check and display the dimensions of the DataFrame
             dimensions = df.shape
             display(Markdown(f"### 📏 **Dimensions (rows, columns):** {dimensions}"))
@@ -118,7 +201,6 @@ class DataPreprocessor:
             self.logger.info("Displayed data types for each column.")
 
             # Check for missing values in each column
-            missing_values = df.isnull().sum()
             display(Markdown("### ❓ **Missing Values:**"))
             if missing_values.any():
                 display(missing_values[missing_values > 0])
@@ -128,7 +210,6 @@ class DataPreprocessor:
                 self.logger.info("No missing values detected.")
 
             # Check and display the count of unique values for each column
-            unique_values = df.nunique()
             display(Markdown("### 🔍 **Unique Values in Each Column:**"))
             display(unique_values)
 
@@ -144,27 +225,166 @@ class DataPreprocessor:
                 display(duplicates)
 
             # Summary statistics for numeric columns
-            summary_statistics = df.describe(include='number')
             display(Markdown("### 📈 **Summary Statistics for Numeric Columns:**"))
             display(summary_statistics)
 
+            if numeric_df.shape[1] == 0:
+                self.logger.info("No numeric columns; skipping correlation and outlier detection.")
+                return
+
+            # Column-major, so the per-column reductions below scan contiguous memory
+            arr = np.asfortranarray(numeric_df.to_numpy(dtype=np.float64))
+
             # Correlation matrix (only for numeric columns)
-            correlation_matrix = df.corr()
-            display(Markdown("### 🔗 **Correlation Matrix:**"))
-            display(correlation_matrix)
+            if numeric_df.shape[1] >= 2:
+                if np.isnan(arr).any():
+                    # np.corrcoef propagates NaN; pandas uses pairwise-complete observations
+                    correlation_matrix = numeric_df.corr()
+                else:
+                    correlation_matrix = pd.DataFrame(
+                        np.corrcoef(arr, rowvar=False),
+                        index=numeric_df.columns,
+                        columns=numeric_df.columns,
+                    )
+                display(Markdown("### 🔗 **Correlation Matrix:**"))
+                display(correlation_matrix)
+            else:
+                self.logger.info("Fewer than two numeric columns; skipping correlation matrix.")
 
             # Outlier detection using IQR for numeric columns only
-            numeric_df = df.select_dtypes(include='number')
-            Q1 = numeric_df.quantile(0.25)
-            Q3 = numeric_df.quantile(0.75)
+            Q1, Q3 = np.nanquantile(arr, [0.25, 0.75], axis=0)
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
 
-            outlier_counts = ((numeric_df < lower_bound) | (numeric_df > upper_bound)).sum()
+            outlier_counts = pd.Series(
+                ((arr < lower_bound) | (arr > upper_bound)).sum(axis=0),
+                index=numeric_df.columns,
+            )
             display(Markdown("### 🚫 **Outlier Counts in Each Numeric Column:**"))
             display(outlier_counts[outlier_counts > 0])
 
         except Exception as e:
             self.logger.error(f"An error occurred while inspecting the dataset: {e}")
             raise
+
+    def _summarize(self, df: pd.DataFrame, numeric_columns: pd.Index, backend: str = "auto") -> tuple:
+        """
+        Compute missing-value counts, unique-value counts and numeric summary statistics.
+
+        Uses a single DuckDB query or a single Polars ``select`` (see ``inspect`` for how
+        ``backend`` picks one), falling back to pandas when neither is available or when
+        the frame has repeated column names or non-integer, non-float numeric columns.
+
+        Parameters:
+        - df (pd.DataFrame): The DataFrame to summarize.
+        - numeric_columns (pd.Index): The numeric columns to describe.
+        - backend (str): One of ``SUMMARY_BACKENDS``.
+
+        Returns:
+        - tuple: (missing_values, unique_values, summary_statistics) shaped like
+          ``df.isnull().sum()``, ``df.nunique()`` and ``df.describe(include='number')``.
+        """
+        if backend == "auto":
+            backend = "duckdb" if duckdb is not None else "polars" if pl is not None else "pandas"
+        supported = (
+            not df.columns.has_duplicates
+            # Neither engine has AVG/STDDEV for timedelta columns, which pandas counts as numeric
+            and all(dtype.kind in "iuf" for dtype in df.dtypes[numeric_columns])
+        )
+        if supported and backend == "duckdb":
+            return self._summarize_with_duckdb(df, numeric_columns)
+        if supported and backend == "polars":
+            return self._summarize_with_polars(df, numeric_columns)
+        if len(numeric_columns) == 0:
+            # describe(include='number') raises when there is nothing to describe
+            summary_statistics = pd.DataFrame(
+                index=_SUMMARY_STATISTICS, columns=numeric_columns, dtype=np.float64
+            )
+        else:
+            summary_statistics = df.describe(include='number')
+        return df.isnull().sum(), df.nunique(), summary_statistics
+
+    def _summarize_with_duckdb(self, df: pd.DataFrame, numeric_columns: pd.Index) -> tuple:
+        """
+        Compute the ``_summarize`` outputs in one vectorized DuckDB scan over ``df``.
+        """
+        # DuckDB identifiers are case-insensitive, so refer to columns by position
+        positions = {column: i for i, column in enumerate(df.columns)}
+
+        expressions = []
+        for i in range(len(df.columns)):
+            col = f"c{i}"
+            expressions += [f"COUNT(*) - COUNT({col})", f"COUNT(DISTINCT {col})"]
+        for column in numeric_columns:
+            col = f"c{positions[column]}"
+            expressions += [
+                f"COUNT({col})",
+                f"AVG({col})",
+                f"STDDEV_SAMP({col})",
+                f"MIN({col})",
+                f"QUANTILE_CONT({col}, 0.25)",
+                f"QUANTILE_CONT({col}, 0.5)",
+                f"QUANTILE_CONT({col}, 0.75)",
+                f"MAX({col})",
+            ]
+
+        con = duckdb.connect()
+        try:
+            con.register("df", df.set_axis([f"c{i}" for i in range(len(df.columns))], axis=1))
+            row = con.execute(f"SELECT {', '.join(expressions)} FROM df").fetchone()
+        finally:
+            con.close()
+
+        return self._unpack_summary_row(row, df.columns, numeric_columns)
+
+    def _summarize_with_polars(self, df: pd.DataFrame, numeric_columns: pd.Index) -> tuple:
+        """
+        Compute the ``_summarize`` outputs in one parallel Polars ``select`` over ``df``.
+        """
+        # Polars needs unique string column names, so refer to columns by position
+        positions = {column: i for i, column in enumerate(df.columns)}
+
+        expressions = []
+        for i in range(len(df.columns)):
+            col = pl.col(f"c{i}")
+            expressions += [col.null_count(), col.drop_nulls().n_unique()]
+        for column in numeric_columns:
+            col = pl.col(f"c{positions[column]}").cast(pl.Float64)
+            expressions += [
+                col.count(),
+                col.mean(),
+                col.std(),
+                col.min(),
+                col.quantile(0.25, interpolation="linear"),
+                col.quantile(0.5, interpolation="linear"),
+                col.quantile(0.75, interpolation="linear"),
+                col.max(),
+            ]
+        # Every output column of a select needs a distinct name
+        expressions = [expression.alias(str(i)) for i, expression in enumerate(expressions)]
+
+        pdf = pl.from_pandas(df.set_axis([f"c{i}" for i in range(len(df.columns))], axis=1))
+        row = pdf.select(expressions).row(0)
+
+        return self._unpack_summary_row(row, df.columns, numeric_columns)
+
+    @staticmethod
+    def _unpack_summary_row(row: tuple, columns: pd.Index, numeric_columns: pd.Index) -> tuple:
+        """
+        Unpack a flat row of per-column (null count, unique count) pairs followed by the
+        eight ``describe`` statistics per numeric column into the ``_summarize`` outputs.
+        """
+        statistics = _SUMMARY_STATISTICS
+        n_columns = len(columns)
+        counts = np.array(row[: 2 * n_columns], dtype=np.int64).reshape(-1, 2)
+        missing_values = pd.Series(counts[:, 0], index=columns)
+        unique_values = pd.Series(counts[:, 1], index=columns)
+        summary_statistics = pd.DataFrame(
+            np.array(row[2 * n_columns:], dtype=np.float64)
+            .reshape(len(numeric_columns), len(statistics))
+            .T,
+            index=statistics,
+            columns=numeric_columns,
+        )
+        return missing_values, unique_values, summary_statistics
@@ -1,5 +1,5 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import hashlib
+import numpy as np
 import pandas as pd
 import logging
 import os
@@ -20,6 +20,7 @@ class DataVisualizer:
         - log_level (logging level): Logging level (default: logging.INFO).
         """
         self.data = data
+        self._vol_cache: dict[int, np.ndarray] = {}
         self.logger = self.setup_logging(log_file, log_level)
         self.logger.info("DataVisualizer initialized.")
 
@@ -38,11 +39,13 @@ class DataVisualizer:
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-        logger = logging.getLogger(__name__)
+        # One logger per log file, named by a short hash of its path
+        log_key = hashlib.sha1(os.path.abspath(log_file).encode("utf-8")).hexdigest()[:12]
+        logger = logging.getLogger(__name__).getChild(log_key)
         logger.setLevel(log_level)
 
         # Prevent adding multiple handlers in case of multiple class instances
-        if not logger.hasHandlers():
+        if not logger.handlers:
             file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(log_level)
 
@@ -51,11 +54,18 @@ class DataVisualizer:
 
             logger.addHandler(file_handler)
 
+        # A later call may ask for a different level than the existing handler has
+        for handler in logger.handlers:
+            handler.setLevel(log_level)
+
         return logger
 
     def plot_box(self):
         """Plots a box plot of Brent Oil Prices."""
         try:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
             plt.figure(figsize=(8, 4))
             sns.boxplot(data=self.data, y='Price')
             plt.title('Box Plot of Brent Oil Prices')
@@ -68,6 +78,8 @@ class DataVisualizer:
     def plot_price_over_time(self):
         """Plots Brent Oil Prices over time."""
         try:
+            import matplotlib.pyplot as plt
+
             plt.figure(figsize=(10, 4))
             plt.plot(self.data.index, self.data['Price'], label='Brent Oil Price', color='blue')
             plt.title('Brent Oil Prices Over Time')
@@ -82,6 +94,9 @@ class DataVisualizer:
     def plot_price_distribution(self):
         """Plots the distribution of Brent Oil Prices."""
         try:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
             plt.figure(figsize=(10, 4))
             sns.histplot(self.data['Price'], bins=30, kde=True)
             plt.title('Price Distribution')
@@ -95,12 +110,27 @@ class DataVisualizer:
     def plot_yearly_average(self):
         """Plots average Brent Oil Prices per year."""
         try:
-            df = self.data.copy().reset_index()
-            df['Year'] = df['Date'].dt.year
-            yearly_avg = df.groupby('Year')['Price'].mean().reset_index()
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
+            # Dates come from the 'Date' column of load_data() output, else from the index
+            dates = pd.DatetimeIndex(self.data['Date'] if 'Date' in self.data.columns else self.data.index)
+
+            # Aggregate per year with bincount over the (small) year range, skipping NaN
+            # prices and unparsed (NaT) dates
+            prices = self.data['Price'].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(prices) & ~dates.isna()
+            years = dates.year.to_numpy()[valid].astype(np.int64)
+            first_year = years.min()
+            offsets = years - first_year
+            sums = np.bincount(offsets, weights=prices[valid])
+            counts = np.bincount(offsets)
+            observed = counts > 0
+            yearly_years = np.arange(first_year, first_year + len(counts))[observed]
+            yearly_means = sums[observed] / counts[observed]
 
             plt.figure(figsize=(12, 6))
-            sns.barplot(x='Year', y='Price', data=yearly_avg, hue='Year', legend=False, palette='pastel')
+            sns.barplot(x=yearly_years, y=yearly_means, hue=yearly_years, legend=False, palette='pastel')
             plt.title('Average Yearly Brent Oil Prices')
             plt.xlabel('Year')
             plt.ylabel('Average Price (USD per barrel)')
@@ -112,12 +142,30 @@ class DataVisualizer:
         except Exception as e:
             self.logger.error(f"Error in plot_yearly_average: {e}")
 
+    def rolling_volatility(self, window=30) -> np.ndarray:
+        """
+        Returns the rolling standard deviation of prices, aligned with ``self.data.index``.
+
+        Results are cached per window; the first ``window - 1`` values are NaN, as with
+        ``Series.rolling(window).std()``.
+        """
+        if window not in self._vol_cache:
+            prices = self.data['Price'].to_numpy(dtype=np.float64)
+            volatility = np.full(len(prices), np.nan)
+            if len(prices) >= window:
+                windows = np.lib.stride_tricks.sliding_window_view(prices, window)
+                volatility[window - 1:] = windows.std(axis=1, ddof=1)
+            self._vol_cache[window] = volatility
+        return self._vol_cache[window]
+
     def plot_rolling_volatility(self, window=30):
         """Plots the rolling volatility (standard deviation) of Brent Oil Prices."""
         try:
-            self.data['Rolling_Volatility'] = self.data['Price'].rolling(window=window).std()
+            import matplotlib.pyplot as plt
+
+            rolling_volatility = self.rolling_volatility(window)
             plt.figure(figsize=(10, 4))
-            plt.plot(self.data.index, self.data['Rolling_Volatility'], color='red', label=f'{window}-Day Rolling Volatility')
+            plt.plot(self.data.index, rolling_volatility, color='red', label=f'{window}-Day Rolling Volatility')
             plt.title(f'{window}-Day Rolling Volatility of Brent Oil Prices')
             plt.xlabel('Date')
             plt.ylabel('Volatility (Rolling Standard Deviation)')
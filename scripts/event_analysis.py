@@ -1,15 +1,11 @@
+import hashlib
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import ruptures as rpt
-import pymc as pm
-import arviz as az
 import logging
 from datetime import timedelta
 from scipy import stats
-from matplotlib import rcParams
+from scipy.special import gammaln
 
 
 class BrentOilEventAnalyzer:
@@ -35,9 +31,18 @@ class BrentOilEventAnalyzer:
         log_file="../logs/brent_oil_analyzer.log",
         log_level=logging.INFO,
     ):
+        if not isinstance(price_data.index, pd.DatetimeIndex):
+            raise ValueError("price_data must be indexed by date (DatetimeIndex).")
+        # Window lookups use binary search, which requires a sorted index
+        if not price_data.index.is_monotonic_increasing:
+            price_data = price_data.sort_index()
         self.price_data = price_data
         self.logger = self.setup_logging(log_file, log_level)
         self.mean_price = self.price_data["Price"].mean()
+        self._dates = self.price_data.index.to_numpy()
+        self._prices = np.ascontiguousarray(self.price_data["Price"].to_numpy(dtype=np.float64))
+        # Log prices turn cumulative returns over any window into one subtraction
+        self._log_prices = np.log(self._prices)
         self.logger.info("BrentOilEventAnalyzer initialized.")
 
     def setup_logging(self, log_file, log_level):
@@ -45,10 +50,12 @@ class BrentOilEventAnalyzer:
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-        logger = logging.getLogger(__name__)
+        # One logger per log file, named by a short hash of its path
+        log_key = hashlib.sha1(os.path.abspath(log_file).encode("utf-8")).hexdigest()[:12]
+        logger = logging.getLogger(__name__).getChild(log_key)
         logger.setLevel(log_level)
 
-        if not logger.hasHandlers():
+        if not logger.handlers:
             file_handler = logging.FileHandler(
                 log_file, encoding="utf-8"
             )  # Set encoding to utf-8
@@ -59,14 +66,20 @@ class BrentOilEventAnalyzer:
 
             logger.addHandler(file_handler)
 
+        # A later call may ask for a different level than the existing handler has
+        for handler in logger.handlers:
+            handler.setLevel(log_level)
+
         return logger
 
     def calculate_cusum(self,color='red'):
         """📉 Computes and visualizes the CUSUM of price deviations."""
         try:
+            import matplotlib.pyplot as plt
+
             # Set font to one that supports emojis
-            rcParams["font.family"] = "sans-serif"
-            rcParams["font.sans-serif"] = ["Segoe UI Emoji", "DejaVu Sans"]
+            plt.rcParams["font.family"] = "sans-serif"
+            plt.rcParams["font.sans-serif"] = ["Segoe UI Emoji", "DejaVu Sans"]
 
             plt.figure(figsize=(12, 6))  
             cusum = (self.price_data["Price"] - self.mean_price).cumsum()
@@ -92,33 +105,35 @@ class BrentOilEventAnalyzer:
             self.logger.error("❌ Error calculating or plotting CUSUM: %s", e)
 
     def detect_change_point(self, n_bkps=5):
-        """🚀 Detects structural changes in oil prices using the ruptures package."""
+        """🚀 Detects structural changes in oil prices using the ruptures package (linear-kernel CPD)."""
         try:
+            import matplotlib.pyplot as plt
+            import ruptures as rpt
+
             plt.figure(figsize=(12, 6))
-            price_df = self.price_data.reset_index()
-            price_series = price_df["Price"].values
 
-            algo = rpt.Binseg(model="rbf").fit(price_series)
+            # Linear-kernel CPD (mean shifts) solved exactly by the C dynamic-programming
+            # backend; the rbf Gram matrix used previously scales quadratically with n.
+            algo = rpt.KernelCPD(kernel="linear", min_size=30).fit(self._prices)
             change_points = algo.predict(n_bkps=n_bkps)
 
-            change_years = [price_df["Date"].iloc[cp].year for cp in change_points[:-1]]
+            change_years = [self.price_data.index[cp].year for cp in change_points[:-1]]
             print("📌 Detected Change Point Years:", change_years)
 
             plt.plot(
-                price_df["Date"],
-                price_df["Price"],
+                self._dates,
+                self._prices,
                 label="📊 Brent Oil Price",
                 color="blue",
             ) 
 
-            for cp in change_points[:-1]:
-                year = price_df["Date"].iloc[cp].year
+            for cp, year in zip(change_points[:-1], change_years):
                 plt.axvline(
-                    price_df["Date"].iloc[cp], color="red", linestyle="--", alpha=0.7
+                    self._dates[cp], color="red", linestyle="--", alpha=0.7
                 )
                 plt.text(
-                    price_df["Date"].iloc[cp],
-                    price_df["Price"].iloc[cp],
+                    self._dates[cp],
+                    self._prices[cp],
                     str(year),
                     color="red",
                     fontsize=10,
@@ -137,133 +152,156 @@ class BrentOilEventAnalyzer:
         except Exception as e:
             self.logger.error("❌ Error detecting change points: %s", e)
 
-    def bayesian_change_point_detection(self):
-        """🔬 Bayesian analysis of structural changes in oil prices using PyMC."""
+    def bayesian_change_point_detection(self, use_mcmc=False):
+        """
+        🔬 Bayesian analysis of a single structural change in oil prices.
+
+        By default the exact posterior over the change point is computed in closed form,
+        with conjugate Normal-Inverse-Gamma priors on each regime's mean and variance.
+        Set ``use_mcmc=True`` to sample the PyMC model instead and plot its traces.
+        """
         try:
-            plt.figure(figsize=(12, 6))
-            data = self.price_data["Price"].values
-            prior_mu = np.mean(data)
+            if use_mcmc:
+                change_point_estimate = self._sample_change_point_posterior()
+            else:
+                change_point_estimate = self._analytic_change_point_posterior()
+            change_point_date = self.price_data.index[change_point_estimate]
 
-            with pm.Model() as model:
-                change_point = pm.DiscreteUniform(
-                    "change_point", lower=0, upper=len(data) - 1
-                )
-                mu1 = pm.Normal("mu1", mu=prior_mu, sigma=5)
-                mu2 = pm.Normal("mu2", mu=prior_mu, sigma=5)
-                sigma1 = pm.HalfNormal("sigma1", sigma=5)
-                sigma2 = pm.HalfNormal("sigma2", sigma=5)
-
-                likelihood = pm.Normal(
-                    "likelihood",
-                    mu=pm.math.switch(change_point >= np.arange(len(data)), mu1, mu2),
-                    sigma=pm.math.switch(
-                        change_point >= np.arange(len(data)), sigma1, sigma2
-                    ),
-                    observed=data,
-                )
+            print(f"🕵️‍♂️ Estimated Change Point Date: {change_point_date}")
+            self.logger.info("📌 Estimated change point date: %s", change_point_date)
 
-                trace = pm.sample(20, tune=10, chains=2, random_seed=42)
-                self.logger.info("✅ Bayesian sampling completed successfully.")
+            return change_point_date
+        except Exception as e:
+            self.logger.error("❌ Error in Bayesian change point analysis: %s", e)
 
-                az.plot_trace(trace)
-                plt.show()
+    def _analytic_change_point_posterior(self, kappa0=1.0, alpha0=1.0):
+        """
+        Computes the posterior of a single change point from prefix sums and returns the
+        position of its mode (the last observation of the first regime).
+        """
+        import matplotlib.pyplot as plt
+
+        # Missing prices would poison the prefix sums; fit on observed prices only and map
+        # positions back to the full index afterwards
+        observed = np.flatnonzero(~np.isnan(self._prices))
+        if len(observed) < 2:
+            raise ValueError("At least two non-missing prices are required.")
+        if len(observed) < len(self._prices):
+            self.logger.warning(
+                "⚠️ Ignoring %d missing prices in change point analysis.",
+                len(self._prices) - len(observed),
+            )
+        data = self._prices[observed]
+        n = len(data)
+        # Centre on the overall mean (the prior mean) to keep the prefix sums well conditioned
+        x = data - data.mean()
+        beta0 = x.var() if x.var() > 0 else 1.0
+
+        csum = np.concatenate(([0.0], np.cumsum(x)))
+        csum2 = np.concatenate(([0.0], np.cumsum(x**2)))
+        k = np.arange(1, n)  # size of the first regime
+
+        def log_marginal(count, total, total_sq):
+            mean = total / count
+            scatter = np.maximum(total_sq - total * mean, 0.0)
+            kappa_n = kappa0 + count
+            alpha_n = alpha0 + count / 2
+            beta_n = beta0 + 0.5 * scatter + kappa0 * count * mean**2 / (2 * kappa_n)
+            return (
+                gammaln(alpha_n)
+                - gammaln(alpha0)
+                + alpha0 * np.log(beta0)
+                - alpha_n * np.log(beta_n)
+                + 0.5 * (np.log(kappa0) - np.log(kappa_n))
+                - count / 2 * np.log(2 * np.pi)
+            )
 
-                s_posterior = trace.posterior["change_point"].values.flatten()
-                change_point_estimate = int(np.median(s_posterior))
-                change_point_date = self.price_data.index[change_point_estimate]
+        log_posterior = log_marginal(k, csum[k], csum2[k]) + log_marginal(
+            n - k, csum[n] - csum[k], csum2[n] - csum2[k]
+        )
+        posterior = np.exp(log_posterior - log_posterior.max())
+        posterior /= posterior.sum()
+        self.logger.info("✅ Analytic change point posterior computed successfully.")
+
+        plt.figure(figsize=(12, 6))
+        plt.plot(self.price_data.index[observed[k - 1]], posterior, color="purple")
+        plt.title("🔬 Posterior Probability of the Change Point", fontsize=14, fontweight="bold")
+        plt.xlabel("📆 Date")
+        plt.ylabel("Posterior Probability")
+        plt.grid(True, linestyle="--", alpha=0.6)
+        plt.show()
 
-                print(f"🕵️‍♂️ Estimated Change Point Date: {change_point_date}")
-                self.logger.info(
-                    "📌 Estimated change point date: %s", change_point_date
-                )
+        return int(observed[k[np.argmax(posterior)] - 1])
 
-                return change_point_date
-        except Exception as e:
-            self.logger.error("❌ Error in Bayesian change point analysis: %s", e)
+    def _sample_change_point_posterior(self):
+        """Samples the single change point model with PyMC and returns the posterior median."""
+        import arviz as az
+        import matplotlib.pyplot as plt
+        import pymc as pm
 
-    def _get_prices_around_event(self, event_date, days_before=30, days_after=30):
-        """Helper function to get prices around a given event date."""
-        before_date = event_date - timedelta(days=days_before)
-        after_date = event_date + timedelta(days=days_after)
-        prices_around_event = self.price_data[(self.price_data.index >= before_date) & (self.price_data.index <= after_date)]
-        return prices_around_event
+        plt.figure(figsize=(12, 6))
+        data = self.price_data["Price"].values
+        prior_mu = np.mean(data)
 
+        with pm.Model() as model:
+            change_point = pm.DiscreteUniform(
+                "change_point", lower=0, upper=len(data) - 1
+            )
+            mu1 = pm.Normal("mu1", mu=prior_mu, sigma=5)
+            mu2 = pm.Normal("mu2", mu=prior_mu, sigma=5)
+            sigma1 = pm.HalfNormal("sigma1", sigma=5)
+            sigma2 = pm.HalfNormal("sigma2", sigma=5)
+
+            likelihood = pm.Normal(
+                "likelihood",
+                mu=pm.math.switch(change_point >= np.arange(len(data)), mu1, mu2),
+                sigma=pm.math.switch(
+                    change_point >= np.arange(len(data)), sigma1, sigma2
+                ),
+                observed=data,
+            )
 
-    def analyze_price_changes_around_events(self, key_events):
-        """Analyzes and plots price changes around specific events."""
-        results = []
+            trace = pm.sample(20, tune=10, chains=2, random_seed=42)
+            self.logger.info("✅ Bayesian sampling completed successfully.")
 
-        for event, date in key_events.items():
-            try:
-                event_date = pd.to_datetime(date)
-                prices_around_event = self._get_prices_around_event(event_date, days_before=180, days_after=180)
-
-                # Calculate percentage changes at different intervals
-                change_1m = self._calculate_percentage_change(event_date, 30)
-                change_3m = self._calculate_percentage_change(event_date, 90)
-                change_6m = self._calculate_percentage_change(event_date, 180)
-
-                # Calculate cumulative returns around the event
-                cum_return_before = prices_around_event.loc[:event_date].pct_change().add(1).cumprod().iloc[-1] - 1
-                cum_return_after = prices_around_event.loc[event_date:].pct_change().add(1).cumprod().iloc[-1] - 1
-
-                results.append({
-                    "Event": event,
-                    "Date": date,
-                    "Change_1M": change_1m,
-                    "Change_3M": change_3m,
-                    "Change_6M": change_6m,
-                    "Cumulative Return Before": cum_return_before['Price'],
-                    "Cumulative Return After": cum_return_after['Price']
-                })
-            except KeyError:
-                self.logger.warning("Event %s at %s is out of price data range.", event, date)
+        az.plot_trace(trace)
+        plt.show()
 
-        event_impact_df = pd.DataFrame(results)
-        self._plot_price_trends_around_events(key_events)
-        self._plot_percentage_changes_and_cumulative_returns(event_impact_df)
-        t_test_df = self._perform_statistical_analysis(key_events)
+        s_posterior = trace.posterior["change_point"].values.flatten()
+        return int(np.median(s_posterior))
 
-        return event_impact_df, t_test_df
+    def _get_prices_around_event(self, event_date, days_before=30, days_after=30):
+        """Helper function to get prices around a given event date."""
+        index = self.price_data.index
+        start = index.searchsorted(event_date - timedelta(days=days_before), side="left")
+        stop = index.searchsorted(event_date + timedelta(days=days_after), side="right")
+        return self.price_data.iloc[start:stop]
 
-    def _calculate_percentage_change(self, event_date, days):
-        """Calculates the percentage change in price before and after a given number of days around an event."""
-        try:
-            price_before = self.price_data.loc[event_date - timedelta(days=days), 'Price']
-            price_after = self.price_data.loc[event_date + timedelta(days=days), 'Price']
-            return ((price_after - price_before) / price_before) * 100
-        except KeyError:
-            return None
 
     def analyze_price_changes_around_events(self, key_events):
         """Analyzes and plots price changes around specific events."""
         results = []
+        event_dates = pd.to_datetime(list(key_events.values()))
 
-        for event, date in key_events.items():
-            try:
-                event_date = pd.to_datetime(date)
-                prices_around_event = self._get_prices_around_event(event_date, days_before=180, days_after=180)
-
-                # Calculate percentage changes at different intervals
-                change_1m = self._calculate_percentage_change(event_date, 30)
-                change_3m = self._calculate_percentage_change(event_date, 90)
-                change_6m = self._calculate_percentage_change(event_date, 180)
-
-                # Calculate cumulative returns around the event
-                cum_return_before = prices_around_event.loc[:event_date].pct_change().add(1).cumprod().iloc[-1] - 1
-                cum_return_after = prices_around_event.loc[event_date:].pct_change().add(1).cumprod().iloc[-1] - 1
-
-                results.append({
-                    "Event": event,
-                    "Date": date,
-                    "Change_1M": change_1m,
-                    "Change_3M": change_3m,
-                    "Change_6M": change_6m,
-                    "Cumulative Return Before": cum_return_before['Price'],
-                    "Cumulative Return After": cum_return_after['Price']
-                })
-            except KeyError:
+        percentage_changes, cum_returns_before, cum_returns_after, in_range = self._event_stats(
+            event_dates, days_list=(30, 90, 180), window_days=180
+        )
+
+        for i, (event, date) in enumerate(key_events.items()):
+            if not in_range[i]:
                 self.logger.warning("Event %s at %s is out of price data range.", event, date)
+                continue
+
+            change_1m, change_3m, change_6m = percentage_changes[i]
+            results.append({
+                "Event": event,
+                "Date": date,
+                "Change_1M": change_1m,
+                "Change_3M": change_3m,
+                "Change_6M": change_6m,
+                "Cumulative Return Before": cum_returns_before[i],
+                "Cumulative Return After": cum_returns_after[i]
+            })
 
         event_impact_df = pd.DataFrame(results)
         self._plot_price_trends_around_events(key_events)
@@ -272,17 +310,80 @@ class BrentOilEventAnalyzer:
 
         return event_impact_df, t_test_df
 
-    def _calculate_percentage_change(self, event_date, days):
-        """Calculates the percentage change in price before and after a given number of days around an event."""
-        try:
-            price_before = self.price_data.loc[event_date - timedelta(days=days), 'Price']
-            price_after = self.price_data.loc[event_date + timedelta(days=days), 'Price']
-            return ((price_after - price_before) / price_before) * 100
-        except KeyError:
-            return None
+    def _event_stats(self, event_dates, days_list, window_days):
+        """
+        Calculates per-event statistics for all events at once.
+
+        Every lookup is a vectorized binary search over the sorted index.
+
+        Returns:
+        - tuple: (percentage_changes, cum_returns_before, cum_returns_after, in_range), where
+          ``percentage_changes`` has one column per offset in ``days_list``, the cumulative
+          returns cover ``window_days`` before/after each event, and ``in_range`` flags
+          events whose window contains price data.
+        """
+        index = self.price_data.index
+
+        # Calculate percentage changes at different intervals
+        percentage_changes = self._calculate_percentage_changes(event_dates, days_list)
+
+        # Locate the windows and the event itself
+        window = pd.Timedelta(days=window_days)
+        window_start = index.searchsorted(event_dates - window, side="left")
+        window_stop = index.searchsorted(event_dates + window, side="right")
+        event_start = index.searchsorted(event_dates, side="left")
+        event_stop = index.searchsorted(event_dates, side="right")
+
+        # Calculate cumulative returns around the events
+        cum_returns_before = self._cumulative_returns(window_start, event_stop - 1)
+        cum_returns_after = self._cumulative_returns(event_start, window_stop - 1)
+
+        return percentage_changes, cum_returns_before, cum_returns_after, window_start < window_stop
+
+    def _calculate_percentage_changes(self, event_dates, days_list):
+        """
+        Calculates the percentage change in price between ``days`` before and after each
+        event, for every offset in ``days_list``.
+
+        Prices are taken from the nearest trading day (the later one on ties) with a single
+        vectorized reindex; offsets falling outside the price data range give NaN.
+
+        Returns:
+        - np.ndarray: Array of shape (len(event_dates), len(days_list)).
+        """
+        event_ns = pd.DatetimeIndex(event_dates).values[:, None]
+        offsets = np.asarray(days_list, dtype="timedelta64[D]")[None, :]
+        targets = pd.DatetimeIndex(
+            np.concatenate([(event_ns - offsets).ravel(), (event_ns + offsets).ravel()])
+        )
+
+        # reindex only resolves ties towards the later date for sorted targets, so look up
+        # the targets in sorted order and scatter the prices back
+        order = np.argsort(targets.values, kind="stable")
+        index = self.price_data.index
+        prices = np.empty(len(targets))
+        prices[order] = self.price_data["Price"].reindex(targets[order], method="nearest").to_numpy(dtype=np.float64)
+        prices[(targets < index[0]) | (targets > index[-1])] = np.nan
+
+        price_before, price_after = prices.reshape(2, len(event_ns), len(days_list))
+        return ((price_after - price_before) / price_before) * 100
+
+    def _cumulative_returns(self, first, last):
+        """
+        Calculates the cumulative return from position ``first`` to ``last`` for each pair
+        of positions; pairs spanning fewer than two prices give NaN.
+        """
+        first = np.asarray(first)
+        last = np.asarray(last)
+        returns = np.full(len(first), np.nan)
+        valid = last > first
+        returns[valid] = np.expm1(self._log_prices[last[valid]] - self._log_prices[first[valid]])
+        return returns
 
     def _plot_price_trends_around_events(self, key_events, days_before=180, days_after=180):
         """Plots price trends around specified events."""
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(14, 8))
         for event, date in key_events.items():
             event_date = pd.to_datetime(date)
@@ -298,6 +399,9 @@ class BrentOilEventAnalyzer:
 
     def _plot_percentage_changes_and_cumulative_returns(self, event_impact_df):
         """Plots percentage changes and cumulative returns before and after events."""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         fig, axes = plt.subplots(2, 1, figsize=(12, 10))
 
         # Plot for percentage changes
@@ -319,19 +423,49 @@ class BrentOilEventAnalyzer:
         plt.tight_layout()
         plt.show()
 
-    def _perform_statistical_analysis(self, key_events):
+    def _perform_statistical_analysis(self, key_events, days=180):
         """Performs a t-test to assess significant price changes before and after events."""
-        t_test_results = {}
-        for event, date in key_events.items():
-            event_date = pd.to_datetime(date)
-            try:
-                before_prices = self._get_prices_around_event(event_date, days_before=180).loc[:event_date]['Price']
-                after_prices = self._get_prices_around_event(event_date, days_after=180).loc[event_date:]['Price']
-                t_stat, p_val = stats.ttest_ind(before_prices, after_prices, nan_policy='omit')
-                t_test_results[event] = {"t-statistic": t_stat, "p-value": p_val}
-            except KeyError:
-                self.logger.warning("Event %s at %s is out of price data range.", event, date)
+        event_dates = pd.to_datetime(list(key_events.values()))
+        index = self.price_data.index
+        window = pd.Timedelta(days=days)
+
+        # NaN-padded (events x window) matrices so every event is tested in one call
+        before_prices = self._stack_price_windows(
+            index.searchsorted(event_dates - window, side="left"),
+            index.searchsorted(event_dates, side="right"),
+        )
+        after_prices = self._stack_price_windows(
+            index.searchsorted(event_dates, side="left"),
+            index.searchsorted(event_dates + window, side="right"),
+        )
+        # ttest_ind(nan_policy='omit') would test each NaN-padded row separately; the
+        # per-row moments feed ttest_ind_from_stats, which is vectorized over events
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t_stat, p_val = stats.ttest_ind_from_stats(
+                *self._window_moments(before_prices), *self._window_moments(after_prices)
+            )
 
-        t_test_df = pd.DataFrame(t_test_results).T
+        t_test_df = pd.DataFrame(
+            {"t-statistic": np.asarray(t_stat), "p-value": np.asarray(p_val)},
+            index=list(key_events.keys()),
+        )
         print(t_test_df)
-        return t_test_df
\ No newline at end of file
+        return t_test_df
+
+    def _stack_price_windows(self, start, stop):
+        """Stacks the prices at positions [start, stop) of each event into a NaN-padded matrix."""
+        lengths = np.maximum(stop - start, 0)
+        columns = np.arange(lengths.max(initial=0))
+        windows = np.full((len(start), len(columns)), np.nan)
+        valid = columns[None, :] < lengths[:, None]
+        windows[valid] = self._prices[(start[:, None] + columns[None, :])[valid]]
+        return windows
+
+    @staticmethod
+    def _window_moments(windows):
+        """Returns the per-row mean, sample standard deviation and count, ignoring NaN."""
+        counts = np.sum(~np.isnan(windows), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.nansum(windows, axis=1) / counts
+            variances = np.nansum((windows - means[:, None]) ** 2, axis=1) / (counts - 1)
+        return means, np.sqrt(variances), counts
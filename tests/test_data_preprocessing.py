@@ -5,6 +5,7 @@ import pandas as pd
 import sys
 import os
 from unittest.mock import patch, MagicMock
+from IPython.display import Markdown
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from scripts.data_preprocessing import DataPreprocessor
@@ -48,6 +49,44 @@ def test_logging_setup(sample_csv, tmp_path):
     assert "Test log message" in log_content
 
 
+def test_logging_setup_does_not_duplicate_handlers(sample_csv, tmp_path):
+    log_file = str(tmp_path / "logfile.log")
+    first = DataPreprocessor(file_path=sample_csv, log_file=log_file)
+    second = DataPreprocessor(file_path=sample_csv, log_file=log_file)
+    assert first.logger is second.logger
+
+    second.logger.info("Logged once")
+    with open(log_file, "r") as f:
+        assert f.read().count("Logged once") == 1
+
+
+def test_logging_setup_keeps_log_files_separate(sample_csv, tmp_path):
+    first_log = str(tmp_path / "first.log")
+    second_log = str(tmp_path / "second.log")
+    first = DataPreprocessor(file_path=sample_csv, log_file=first_log)
+    second = DataPreprocessor(file_path=sample_csv, log_file=second_log)
+
+    assert first.logger.name.count(".") == second.logger.name.count(".") == 2
+    assert first.logger is not second.logger
+
+    first.logger.info("Only in first")
+    second.logger.info("Only in second")
+    with open(first_log, "r") as f:
+        assert "Only in second" not in f.read()
+    with open(second_log, "r") as f:
+        assert "Only in first" not in f.read()
+
+
+def test_logging_setup_applies_later_log_level(sample_csv, tmp_path):
+    log_file = str(tmp_path / "logfile.log")
+    DataPreprocessor(file_path=sample_csv, log_file=log_file)
+    processor = DataPreprocessor(file_path=sample_csv, log_file=log_file, log_level=logging.DEBUG)
+
+    processor.logger.debug("Debug message")
+    with open(log_file, "r") as f:
+        assert "Debug message" in f.read()
+
+
 @patch("pandas.read_csv")
 def test_load_data(mock_read_csv, sample_csv, tmp_path):
     """Tests if load_data correctly reads the file."""
@@ -61,6 +100,73 @@ def test_load_data(mock_read_csv, sample_csv, tmp_path):
     assert pd.api.types.is_datetime64_any_dtype(df["Date"])  # Ensure Date conversion
 
 
+def test_load_data_reads_sample_csv(sample_csv, tmp_path):
+    processor = DataPreprocessor(file_path=sample_csv, output_dir=str(tmp_path / "output"))
+    df = processor.load_data()
+    assert df["Date"].tolist() == [pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-02")]
+    assert df["Value"].tolist() == [100, 200]
+
+
+def test_load_data_parses_dates_from_csv(tmp_path):
+    file_path = tmp_path / "prices.csv"
+    file_path.write_text("Date,Price\n2023-01-01,80.5\n  2023-01-02 ,81.0\n")
+    processor = DataPreprocessor(file_path=str(file_path), output_dir=str(tmp_path))
+    df = processor.load_data()
+    assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+    assert df["Date"].tolist() == [pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-02")]
+    assert df["Price"].tolist() == [80.5, 81.0]
+
+
+def test_load_data_uses_parquet_cache(tmp_path):
+    file_path = tmp_path / "prices.csv"
+    file_path.write_text("Date,Price\n2023-01-01,80.5\n2023-01-02,81.0\n")
+    output_dir = str(tmp_path / "output")
+    first = DataPreprocessor(file_path=str(file_path), output_dir=output_dir).load_data()
+
+    processor = DataPreprocessor(file_path=str(file_path), output_dir=output_dir)
+    assert os.path.exists(processor.cache_file)
+    with patch("pandas.read_csv") as mock_read_csv:
+        cached = processor.load_data()
+    mock_read_csv.assert_not_called()
+    pd.testing.assert_frame_equal(cached, first)
+
+
+def test_load_data_cache_is_keyed_by_source(tmp_path):
+    first_path = tmp_path / "a.csv"
+    first_path.write_text("Date,Price\n2023-01-01,80.5\n")
+    second_path = tmp_path / "b.csv"
+    second_path.write_text("Date,Price\n2024-01-01,70.0\n2024-01-02,71.0\n")
+    # Make the second source older than the first source's cache
+    os.utime(second_path, (0, 0))
+    output_dir = str(tmp_path / "output")
+
+    DataPreprocessor(file_path=str(first_path), output_dir=output_dir).load_data()
+    df = DataPreprocessor(file_path=str(second_path), output_dir=output_dir).load_data()
+    assert df["Price"].tolist() == [70.0, 71.0]
+
+
+def test_load_data_missing_source_ignores_cache(tmp_path):
+    file_path = tmp_path / "prices.csv"
+    file_path.write_text("Date,Price\n2023-01-01,80.5\n")
+    output_dir = str(tmp_path / "output")
+    DataPreprocessor(file_path=str(file_path), output_dir=output_dir).load_data()
+
+    file_path.unlink()
+    with pytest.raises(FileNotFoundError):
+        DataPreprocessor(file_path=str(file_path), output_dir=output_dir).load_data()
+
+
+def test_load_data_survives_cache_write_failure(tmp_path):
+    file_path = tmp_path / "prices.csv"
+    file_path.write_text("Date,Price\n2023-01-01,80.5\n")
+    processor = DataPreprocessor(file_path=str(file_path), output_dir=str(tmp_path / "output"))
+
+    with patch.object(pd.DataFrame, "to_parquet", side_effect=OSError("read-only file system")):
+        df = processor.load_data()
+    assert df["Price"].tolist() == [80.5]
+    assert not os.path.exists(processor.cache_file)
+
+
 def test_inspect_with_empty_dataframe():
     processor = DataPreprocessor(file_path="dummy.csv")
     empty_df = pd.DataFrame()
@@ -68,3 +174,124 @@ def test_inspect_with_empty_dataframe():
         processor.inspect(empty_df)
 
 
+
+@pytest.mark.parametrize(
+    "volume",
+    [[1.0, 3.0, 2.0, 5.0, 4.0], [1.0, None, 2.0, 5.0, 4.0]],
+    ids=["complete", "missing"],
+)
+@patch("scripts.data_preprocessing.display")
+def test_inspect_correlation_matrix(mock_display, volume):
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=5),
+        "Price": [10.0, 12.0, 11.0, 15.0, 14.0],
+        "Volume": volume,
+    })
+    processor.inspect(df)
+
+    displayed = [call.args[0] for call in mock_display.call_args_list]
+    correlation_matrix = next(
+        obj for obj in displayed
+        if isinstance(obj, pd.DataFrame) and list(obj.index) == ["Price", "Volume"]
+    )
+    pd.testing.assert_frame_equal(correlation_matrix, df[["Price", "Volume"]].corr())
+
+
+@pytest.mark.parametrize("use_duckdb", [True, False], ids=["duckdb", "pandas"])
+@patch("scripts.data_preprocessing.display")
+def test_inspect_without_numeric_columns(mock_display, use_duckdb):
+    duckdb = pytest.importorskip("duckdb") if use_duckdb else None
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({"Event": ["a", "b", "b"]})
+    with patch("scripts.data_preprocessing.duckdb", duckdb):
+        processor.inspect(df)
+
+    headings = [
+        call.args[0].data for call in mock_display.call_args_list
+        if isinstance(call.args[0], Markdown)
+    ]
+    assert not any("Outlier Counts" in heading for heading in headings)
+    summary_statistics = mock_display.call_args_list[-1].args[0]
+    assert summary_statistics.shape == (8, 0)
+
+
+@patch("scripts.data_preprocessing.display")
+def test_inspect_skips_correlation_for_single_numeric_column(mock_display):
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=4),
+        "Price": [10.0, 11.0, 12.0, 100.0],
+    })
+    processor.inspect(df)
+
+    headings = [
+        call.args[0].data for call in mock_display.call_args_list
+        if isinstance(call.args[0], Markdown)
+    ]
+    assert not any("Correlation Matrix" in heading for heading in headings)
+    assert mock_display.call_args_list[-1].args[0].to_dict() == {"Price": 1}
+
+
+@patch("scripts.data_preprocessing.display")
+def test_inspect_outlier_counts(mock_display):
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({
+        "Price": [10.0, 11.0, 12.0, 11.5, 10.5, 100.0],
+        "Volume": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    processor.inspect(df)
+
+    outlier_counts = mock_display.call_args_list[-1].args[0]
+    assert isinstance(outlier_counts, pd.Series)
+    assert outlier_counts.to_dict() == {"Price": 1}
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "polars"])
+def test_summarize_backends_match_pandas(backend):
+    pytest.importorskip(backend)
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({
+        "Date": pd.to_datetime(["2023-01-01", None, "2023-01-03", "2023-01-03"]),
+        "Price": [10.0, None, 12.5, 12.5],
+        "Volume": [1, 2, 2, 4],
+        "volume": [5.0, 6.0, 7.0, 9.0],
+    })
+    numeric_columns = df.select_dtypes(include="number").columns
+    missing_values, unique_values, summary_statistics = processor._summarize(
+        df, numeric_columns, backend
+    )
+
+    pd.testing.assert_series_equal(missing_values, df.isnull().sum())
+    pd.testing.assert_series_equal(unique_values, df.nunique())
+    pd.testing.assert_frame_equal(summary_statistics, df.describe(include="number"))
+
+
+@patch("scripts.data_preprocessing.display")
+def test_inspect_uses_requested_summary_backend(mock_display):
+    pytest.importorskip("polars")
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({"Price": [10.0, 11.0, 12.5, 13.0]})
+    with patch.object(
+        DataPreprocessor, "_summarize_with_polars", wraps=processor._summarize_with_polars
+    ) as mock_polars:
+        processor.inspect(df, backend="polars")
+    mock_polars.assert_called_once()
+
+    with pytest.raises(ValueError, match="Unknown summary backend"):
+        processor.inspect(df, backend="spark")
+
+
+@patch("scripts.data_preprocessing.display")
+def test_inspect_with_timedelta_column(mock_display):
+    processor = DataPreprocessor(file_path="dummy.csv")
+    df = pd.DataFrame({
+        "Price": [10.0, 11.0, 12.5, 13.0],
+        "Duration": pd.to_timedelta([1, 2, 3, 4], unit="D"),
+    })
+    missing_values, unique_values, summary_statistics = processor._summarize(
+        df, df.select_dtypes(include="number").columns
+    )
+
+    pd.testing.assert_frame_equal(summary_statistics, df.describe(include="number"))
+    processor.inspect(df)
@@ -0,0 +1,69 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+pytest.importorskip("seaborn")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.data_visualizer import DataVisualizer
+
+
+@pytest.fixture
+def price_data():
+    """Daily prices over several years, with a missing year and a missing price."""
+    index = pd.date_range("2000-01-01", "2005-12-31", freq="D", name="Date")
+    index = index[index.year != 2002]
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"Price": 50 + rng.normal(0, 5, len(index)).cumsum()}, index=index)
+    data.iloc[10, 0] = np.nan
+    return data
+
+
+@pytest.fixture
+def visualizer(price_data, tmp_path):
+    return DataVisualizer(price_data, log_file=str(tmp_path / "visualizer.log"))
+
+
+@patch("matplotlib.pyplot.show")
+@patch("seaborn.barplot")
+def test_plot_yearly_average_matches_groupby(mock_barplot, mock_show, visualizer, price_data):
+    visualizer.plot_yearly_average()
+
+    kwargs = mock_barplot.call_args.kwargs
+    expected = price_data.groupby(price_data.index.year)["Price"].mean()
+    np.testing.assert_array_equal(kwargs["x"], expected.index.to_numpy())
+    np.testing.assert_allclose(kwargs["y"], expected.to_numpy())
+
+
+@patch("matplotlib.pyplot.show")
+@patch("seaborn.barplot")
+def test_plot_yearly_average_uses_date_column(mock_barplot, mock_show, price_data, tmp_path):
+    # load_data() output: a RangeIndex with dates in a 'Date' column, some unparsed
+    data = price_data.reset_index()
+    data.loc[20, "Date"] = pd.NaT
+    visualizer = DataVisualizer(data, log_file=str(tmp_path / "visualizer.log"))
+    visualizer.plot_yearly_average()
+
+    kwargs = mock_barplot.call_args.kwargs
+    expected = data.groupby(data["Date"].dt.year)["Price"].mean()
+    np.testing.assert_array_equal(kwargs["x"], expected.index.to_numpy())
+    np.testing.assert_allclose(kwargs["y"], expected.to_numpy())
+
+
+def test_rolling_volatility_matches_rolling_std(visualizer, price_data):
+    expected = price_data["Price"].rolling(window=30).std().to_numpy()
+    np.testing.assert_allclose(visualizer.rolling_volatility(30), expected, equal_nan=True)
+
+
+def test_rolling_volatility_is_cached_without_mutating_data(visualizer, price_data):
+    columns = list(price_data.columns)
+    with patch("matplotlib.pyplot.show"):
+        visualizer.plot_rolling_volatility(window=30)
+
+    assert list(visualizer.data.columns) == columns
+    assert visualizer.rolling_volatility(30) is visualizer._vol_cache[30]
@@ -0,0 +1,141 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.event_analysis import BrentOilEventAnalyzer
+
+BREAK = 400
+
+
+@pytest.fixture
+def price_data():
+    """Business-day prices with a level shift after position BREAK - 1."""
+    index = pd.bdate_range("2000-01-03", periods=1000, name="Date")
+    rng = np.random.default_rng(0)
+    levels = np.where(np.arange(len(index)) < BREAK, 30.0, 60.0)
+    return pd.DataFrame({"Price": levels + rng.normal(0, 2, len(index))}, index=index)
+
+
+def make_analyzer(price_data, tmp_path):
+    return BrentOilEventAnalyzer(price_data, log_file=str(tmp_path / "analyzer.log"))
+
+
+@patch("matplotlib.pyplot.show")
+def test_bayesian_change_point_recovers_step(mock_show, price_data, tmp_path):
+    analyzer = make_analyzer(price_data, tmp_path)
+    assert analyzer.bayesian_change_point_detection() == price_data.index[BREAK - 1]
+
+
+@patch("matplotlib.pyplot.show")
+def test_bayesian_change_point_ignores_missing_prices(mock_show, price_data, tmp_path):
+    price_data.iloc[[0, 250, BREAK - 1, 700], 0] = np.nan
+    analyzer = make_analyzer(price_data, tmp_path)
+    assert analyzer.bayesian_change_point_detection() == price_data.index[BREAK - 2]
+
+
+def test_percentage_changes_use_nearest_trading_day(price_data, tmp_path):
+    analyzer = make_analyzer(price_data, tmp_path)
+    prices = price_data["Price"]
+    event_dates = pd.to_datetime(["2001-03-14", "2001-06-02", "2000-01-20"])
+    changes = analyzer._calculate_percentage_changes(event_dates, (30, 90))
+
+    def nearest(date):
+        return prices.iloc[prices.index.get_indexer([date], method="nearest")[0]]
+
+    for i, event_date in enumerate(event_dates[:2]):
+        for j, days in enumerate((30, 90)):
+            before = nearest(event_date - pd.Timedelta(days=days))
+            after = nearest(event_date + pd.Timedelta(days=days))
+            assert changes[i, j] == pytest.approx((after - before) / before * 100)
+
+    # 2001-03-14 +/- 30 days are trading days, so this is the original label lookup
+    event_date = event_dates[0]
+    price_before = price_data.loc[event_date - pd.Timedelta(days=30), "Price"]
+    price_after = price_data.loc[event_date + pd.Timedelta(days=30), "Price"]
+    assert changes[0, 0] == pytest.approx((price_after - price_before) / price_before * 100)
+
+    # Offsets reaching before the first price are out of range
+    assert np.isnan(changes[2]).all()
+
+
+@patch("matplotlib.pyplot.show")
+def test_cumulative_returns_match_cumprod(mock_show, price_data, tmp_path):
+    pytest.importorskip("seaborn")
+    analyzer = make_analyzer(price_data, tmp_path)
+    key_events = {"Thursday": "2001-03-15", "Saturday": "2001-06-02", "Late": "2003-09-01"}
+    event_impact_df, _ = analyzer.analyze_price_changes_around_events(key_events)
+
+    for _, row in event_impact_df.iterrows():
+        event_date = pd.to_datetime(row["Date"])
+        prices = analyzer._get_prices_around_event(event_date, days_before=180, days_after=180)
+        before = prices.loc[:event_date].pct_change().add(1).cumprod().iloc[-1] - 1
+        after = prices.loc[event_date:].pct_change().add(1).cumprod().iloc[-1] - 1
+        assert row["Cumulative Return Before"] == pytest.approx(before["Price"])
+        assert row["Cumulative Return After"] == pytest.approx(after["Price"])
+
+
+def test_event_stats_resolve_ties_to_later_day(tmp_path):
+    # 2020-02-02 + 30 days is 2020-03-03, two days from both neighbouring prices
+    price_data = pd.DataFrame(
+        {"Price": [10.0, 20.0, 25.0]},
+        index=pd.DatetimeIndex(["2020-01-03", "2020-03-01", "2020-03-05"], name="Date"),
+    )
+    analyzer = make_analyzer(price_data, tmp_path)
+    event_dates = pd.to_datetime(["2020-01-25", "2020-02-02"])
+    changes, cum_returns_before, cum_returns_after, in_range = analyzer._event_stats(
+        event_dates, days_list=(30, 90), window_days=180
+    )
+
+    assert changes[1, 0] == pytest.approx(150.0)
+    assert np.isnan(changes[:, 1]).all()
+    assert in_range.all()
+    np.testing.assert_allclose(cum_returns_after, [0.25, 0.25])
+
+
+# The reference ttest_ind warns about the empty out-of-range windows
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_statistical_analysis_matches_per_event_ttest(price_data, tmp_path):
+    from scipy import stats
+
+    price_data.iloc[300, 0] = np.nan
+    analyzer = make_analyzer(price_data, tmp_path)
+    key_events = {"A": "2001-03-15", "B": "2001-06-02", "C": "2003-09-01", "Out": "1990-01-01"}
+    t_test_df = analyzer._perform_statistical_analysis(key_events)
+
+    for event, date in key_events.items():
+        event_date = pd.to_datetime(date)
+        before = analyzer._get_prices_around_event(event_date, days_before=180).loc[:event_date]["Price"]
+        after = analyzer._get_prices_around_event(event_date, days_after=180).loc[event_date:]["Price"]
+        t_stat, p_val = stats.ttest_ind(before, after, nan_policy="omit")
+        np.testing.assert_allclose(t_test_df.loc[event, "t-statistic"], t_stat, equal_nan=True)
+        np.testing.assert_allclose(t_test_df.loc[event, "p-value"], p_val, equal_nan=True)
+
+
+@patch("matplotlib.pyplot.show")
+def test_detect_change_point_plots_cached_arrays(mock_show, price_data, tmp_path):
+    import matplotlib.pyplot as plt
+
+    # Shuffled input exercises the one-off sort in __init__
+    analyzer = make_analyzer(price_data.sample(frac=1, random_state=0), tmp_path)
+    analyzer.detect_change_point(n_bkps=1)
+    ax = plt.gca()
+
+    # Original reset_index lookups on the sorted frame
+    df = price_data.reset_index()
+    line = ax.get_lines()[0]
+    np.testing.assert_array_equal(line.get_ydata(), df["Price"].to_numpy())
+    assert pd.DatetimeIndex(line.get_xdata()).equals(pd.DatetimeIndex(df["Date"]))
+
+    vline = ax.get_lines()[1]
+    assert pd.Timestamp(vline.get_xdata()[0]) == df["Date"][BREAK]
+    label = ax.texts[0]
+    assert label.get_text() == str(df["Date"][BREAK].year)
+    assert label.get_position()[1] == df["Price"][BREAK]
+    plt.close("all")